@@ -52,6 +52,7 @@ def compute_optimal_portfolio(
             else (),
             start_date=pd.Timestamp(request_body.start_date),
             end_date=pd.Timestamp(request_body.end_date),
+            dtype="float32",
         ),
         constraints=[con.to_ptf_constraint() for con in request_body.constraints],
         objectives=[obj.to_ptf_objective() for obj in request_body.objectives],
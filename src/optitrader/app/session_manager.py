@@ -47,7 +47,7 @@ class SessionManager:
 
     def __init__(self) -> None:
         """Initialize a Streamlit session object."""
-        self.market_data: MarketData = MarketData()
+        self.market_data: MarketData = MarketData(prefetch=True)
         self.trader: AlpacaTrading = AlpacaTrading()
         self.universe_name = UniverseName.FAANG
         self.objective_names = [ObjectiveName.CVAR]
@@ -165,6 +165,7 @@ class SessionManager:
             self.market_data = MarketData(
                 trading_key=api_key,
                 trading_secret=secret_key,
+                prefetch=True,
             )
             # self.trader = AlpacaTrading(
             #     api_key=api_key,
@@ -31,6 +31,11 @@ class Settings(BaseSettings):
     DB_URI_MARKET: str = "sqlite:///market.db"  # prod
     DB_URI_TEST: str = "sqlite:///test.db"  # test
 
+    # CACHE SETTINGS
+    # set CACHE_DIR to a directory, e.g. ~/.optitrader/cache, to enable the on-disk cache
+    CACHE_DIR: str | None = None
+    CACHE_MAX_AGE_HOURS: float = 12
+
     @property
     def is_trading(self) -> bool:
         """If the settings are for the trading keys."""
@@ -164,6 +164,7 @@ class Optitrader:
                 tickers=self.investment_universe.tickers,
                 start_date=start_date or end_date - pd.Timedelta(days=365 * 2),
                 end_date=end_date,
+                dtype="float32",
             ),
             constraints=self.constraints,
             objectives=self.objectives,
@@ -1,15 +1,34 @@
 """Implementation of Alpaca as DataProvider."""
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 
 import pandas as pd
 from alpaca.broker import BrokerClient
-from alpaca.data import Adjustment, BarSet, StockBarsRequest, StockHistoricalDataClient, TimeFrame
+from alpaca.data import (
+    Adjustment,
+    Bar,
+    BarSet,
+    StockBarsRequest,
+    StockHistoricalDataClient,
+    TimeFrame,
+)
 from alpaca.trading import Asset, AssetClass, AssetStatus, GetAssetsRequest, TradingClient
 
 from optitrader.config import SETTINGS
 from optitrader.enums import BarsField
 from optitrader.market.base_data_provider import BaseDataProvider
+from optitrader.market.sessions import mount_pool
+
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+FIRST_AVAILABLE_DATE = pd.Timestamp("2015-12-12", tz="utc")
+"""The first date with daily bars from Alpaca."""
+BARS_CACHE_TTL = pd.Timedelta(hours=SETTINGS.CACHE_MAX_AGE_HOURS)
+"""How long the daily bars are cached in memory, adjusted bars are restated on splits."""
 
 
 class AlpacaMarketData(BaseDataProvider):
@@ -50,15 +69,24 @@ class AlpacaMarketData(BaseDataProvider):
                 secret_key=broker_secret,
             )
         )
+        # the clients keep a session for all the requests, but its default pool of 10
+        # connections would be exhausted by the threads of get_multi_alpaca_assets
+        for client in (self.__data_client, self.__asset_client):
+            mount_pool(client, pool_connections=20, pool_maxsize=20)
+        # daily OHLCV bars by ticker with the UTC date range they cover and their oldest fetch time
+        self._bar_cache: dict[
+            str, tuple[pd.Timestamp, pd.Timestamp, pd.DataFrame, pd.Timestamp]
+        ] = {}
+        self._bar_cache_lock = threading.Lock()
 
-    def get_bars(
+    def get_bar_set(
         self,
         tickers: tuple[str, ...],
         start_date: pd.Timestamp | None = None,
         end_date: pd.Timestamp | None = None,
-    ) -> pd.DataFrame:
+    ) -> BarSet:
         """
-        Get the daily bars dataframe from alpaca-py historical client.
+        Get the daily bars from alpaca-py historical client.
 
         Parameters
         ----------
@@ -72,10 +100,10 @@ class AlpacaMarketData(BaseDataProvider):
         Returns
         -------
         `bars`
-            a pd.DataFrame with the bars for the tickers.
+            a BarSet with the list of bars of each ticker.
         """
         _last_available_date = pd.Timestamp.utcnow() - pd.Timedelta(15, unit="min")
-        _first_available_date = pd.Timestamp("2015-12-12").tz_localize(tz="utc")
+        _first_available_date = FIRST_AVAILABLE_DATE
         # handle first and last available date from Alpaca
         end_date = (
             end_date
@@ -97,7 +125,140 @@ class AlpacaMarketData(BaseDataProvider):
             )
         )
         assert isinstance(bars, BarSet)
-        return bars.df
+        return bars
+
+    def get_bars(
+        self,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp | None = None,
+        end_date: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Get the daily bars dataframe from alpaca-py historical client.
+
+        Parameters
+        ----------
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+        `start_date`: pd.Timestamp
+            A pd.Timestamp representing start date.
+        `end_date`: pd.Timestamp
+            A pd.Timestamp representing end date.
+
+        Returns
+        -------
+        `bars`
+            a pd.DataFrame with the bars for the tickers.
+        """
+        return self.get_bar_set(
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date,
+        ).df
+
+    @staticmethod
+    def _to_utc(timestamp: pd.Timestamp) -> pd.Timestamp:
+        """Localize a tz-naive timestamp to UTC or convert a tz-aware one."""
+        timestamp = pd.Timestamp(timestamp)
+        return (
+            timestamp.tz_localize(tz="utc")
+            if timestamp.tzinfo is None
+            else timestamp.tz_convert(tz="utc")
+        )
+
+    @staticmethod
+    def _bars_to_frame(bars: list[Bar]) -> pd.DataFrame:
+        """Get the OHLCV dataframe indexed by timestamp from a list of bars."""
+        return pd.DataFrame(
+            {field: [getattr(bar, field) for bar in bars] for field in BarsField.get_values_list()},
+            index=pd.to_datetime([bar.timestamp for bar in bars], utc=True),
+        )
+
+    def get_daily_bars(
+        self,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp | None,
+        end_date: pd.Timestamp | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Get the daily OHLCV bars of each ticker, from the in-memory cache when available.
+
+        The tickers whose cached bars do not cover the date range are fetched
+        with a single request, and merged with the bars in the cache.
+        Today's bar is never considered covered since it is not closed yet.
+
+        Parameters
+        ----------
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+        `start_date`: pd.Timestamp | None
+            A pd.Timestamp representing start date, None or NaT for the first available date.
+        `end_date`: pd.Timestamp
+            A pd.Timestamp representing end date.
+
+        Returns
+        -------
+        `bars`
+            a dict of pd.DataFrame with the bars by ticker, tickers without bars are skipped.
+        """
+        now = pd.Timestamp.utcnow()
+        start = (
+            max(self._to_utc(start_date), FIRST_AVAILABLE_DATE)
+            if not pd.isna(start_date)
+            else FIRST_AVAILABLE_DATE
+        )
+        end = min(self._to_utc(end_date), now) if end_date is not None else now
+        with self._bar_cache_lock:
+            frames = {
+                ticker: self._bar_cache[ticker][2]
+                for ticker in tickers
+                if ticker in self._bar_cache
+                and self._bar_cache[ticker][0] <= start
+                and end <= self._bar_cache[ticker][1]
+                and now - self._bar_cache[ticker][3] <= BARS_CACHE_TTL
+            }
+        missing = tuple(ticker for ticker in tickers if ticker not in frames)
+        if missing:
+            bar_set = self.get_bar_set(tickers=missing, start_date=start_date, end_date=end_date)
+            fetched = {
+                # the bar set data is typed with the base model of its bars
+                ticker: self._bars_to_frame(bars)  # type: ignore
+                for ticker, bars in bar_set.data.items()
+            }
+            frames.update(fetched)
+            covered_end = min(end, now.normalize())
+            if start <= covered_end:
+                with self._bar_cache_lock:
+                    for ticker, frame in fetched.items():
+                        self._cache_bars(ticker, frame, start, covered_end, now)
+        return {
+            ticker: frame[(frame.index >= start) & (frame.index <= end)]
+            for ticker, frame in frames.items()
+            if not frame.empty
+        }
+
+    def _cache_bars(
+        self,
+        ticker: str,
+        frame: pd.DataFrame,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        fetched_at: pd.Timestamp,
+    ) -> None:
+        """Cache the bars, merging them with the unexpired cached ones when date ranges overlap."""
+        if ticker in self._bar_cache:
+            cached_start, cached_end, cached_frame, cached_fetched_at = self._bar_cache[ticker]
+            if (
+                start <= cached_end
+                and end >= cached_start
+                and fetched_at - cached_fetched_at <= BARS_CACHE_TTL
+            ):
+                # newly fetched bars take precedence over the cached ones,
+                # the merged bars expire with the oldest ones
+                frame = frame.combine_first(cached_frame)
+                start, end = min(start, cached_start), max(end, cached_end)
+                fetched_at = cached_fetched_at
+        self._bar_cache[ticker] = (start, end, frame, fetched_at)
 
     def get_prices(
         self,
@@ -123,14 +284,14 @@ class AlpacaMarketData(BaseDataProvider):
         `bars`
             a pd.DataFrame with the bars for the tickers.
         """
-        bars = self.get_bars(
+        bars = self.get_daily_bars(
             tickers=tickers,
             start_date=start_date,
             end_date=end_date,
         )
-        bars.reset_index(inplace=True)
-        _index_name = "timestamp"
-        prices = bars.pivot(index=_index_name, columns="symbol", values=bars_field)
+        prices = pd.DataFrame(
+            {ticker: bars[ticker][bars_field.value] for ticker in sorted(bars)}
+        ).rename_axis(index="timestamp", columns="symbol")
         prices.index = prices.index.strftime("%Y-%m-%d")
         return prices.ffill().bfill()
 
@@ -140,6 +301,18 @@ class AlpacaMarketData(BaseDataProvider):
         assert isinstance(asset, Asset)
         return asset
 
+    def get_multi_alpaca_assets(self, tickers: tuple[str, ...]) -> dict[str, Asset]:
+        """Get alpaca assets by tickers concurrently, skipping the ones not found."""
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            futures = {ticker: executor.submit(self.get_alpaca_asset, ticker) for ticker in tickers}
+        assets = {}
+        for ticker, future in futures.items():
+            try:
+                assets[ticker] = future.result()
+            except Exception as error:
+                log.debug(f"{ticker}: {type(error)}")
+        return assets
+
     @lru_cache(maxsize=256)  # noqa: B019
     def get_alpaca_assets(
         self,
@@ -0,0 +1,214 @@
+"""Local on-disk cache of market data stored as parquet files."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from optitrader.config import SETTINGS
+
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+_METADATA_KEY = b"optitrader"
+
+
+class DiskCache:
+    """
+    Class to persist market data dataframes across processes.
+
+    Each dataframe is stored in its own parquet file, named after a hash of the
+    arguments that produced it. Prices files also record the date range they cover,
+    so that any request within that range is sliced from disk instead of refetched.
+    Files older than `max_age` are ignored since adjusted prices and financials
+    can be restated by the data provider, for prices the age is the one of the
+    oldest fetched rows, since merging newer prices rewrites the file.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = SETTINGS.CACHE_DIR or "~/.optitrader/cache",
+        max_age: pd.Timedelta | None = None,
+    ) -> None:
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_age = (
+            max_age if max_age is not None else pd.Timedelta(hours=SETTINGS.CACHE_MAX_AGE_HOURS)
+        )
+
+    def get_path(self, namespace: str, *key: object) -> Path:
+        """Get the parquet file path for the key in the namespace."""
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return self.cache_dir / namespace / f"{digest}.parquet"
+
+    def _is_fresh(self, path: Path) -> bool:
+        """Whether the file exists and is younger than max_age."""
+        return path.exists() and time.time() - path.stat().st_mtime <= self.max_age.total_seconds()
+
+    def _read_table(self, path: Path) -> pa.Table | None:
+        """Read the parquet table, None if missing, expired or unreadable."""
+        if not self._is_fresh(path):
+            return None
+        try:
+            return pq.read_table(path)
+        except (OSError, pa.ArrowException) as error:
+            log.warning(f"Unable to read {path}: {type(error)}")
+            return None
+
+    def _write_table(self, path: Path, df: pd.DataFrame, metadata: dict | None = None) -> None:
+        """Write the dataframe to the parquet file, failures are only logged."""
+        try:
+            table = pa.Table.from_pandas(df)
+            if metadata is not None:
+                table = table.replace_schema_metadata(
+                    {**(table.schema.metadata or {}), _METADATA_KEY: json.dumps(metadata)}
+                )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so that readers never see a partial file
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException, TypeError, ValueError) as error:
+            log.warning(f"Unable to write {path}: {type(error)}")
+
+    def get_frame(self, namespace: str, *key: object) -> pd.DataFrame | None:
+        """Get a cached dataframe, None on cache miss."""
+        table = self._read_table(self.get_path(namespace, *key))
+        return table.to_pandas() if table is not None else None
+
+    def set_frame(self, df: pd.DataFrame, namespace: str, *key: object) -> None:
+        """Cache a dataframe, empty dataframes are not stored."""
+        if not df.empty:
+            self._write_table(self.get_path(namespace, *key), df)
+
+    @staticmethod
+    def _to_date(timestamp: pd.Timestamp | None) -> pd.Timestamp:
+        """Normalize a timestamp to a tz-naive date, None means today."""
+        timestamp = pd.Timestamp(timestamp) if timestamp is not None else pd.Timestamp.today()
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_localize(None)
+        return timestamp.normalize()
+
+    def _read_prices(
+        self,
+        path: Path,
+    ) -> tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp, float] | None:
+        """Read the prices file with the date range it covers and its oldest fetch time."""
+        table = self._read_table(path)
+        if table is None or _METADATA_KEY not in (table.schema.metadata or {}):
+            return None
+        covered = json.loads(table.schema.metadata[_METADATA_KEY])
+        # merges rewrite the file, so the expiry is based on the oldest fetched rows
+        fetched_at = covered.get("fetched_at")
+        if fetched_at is None or time.time() - fetched_at > self.max_age.total_seconds():
+            return None
+        return (
+            table.to_pandas(),
+            pd.Timestamp(covered["start_date"]),
+            pd.Timestamp(covered["end_date"]),
+            fetched_at,
+        )
+
+    def get_prices(
+        self,
+        provider: str,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp | None,
+        bars_field: str,
+    ) -> pd.DataFrame | None:
+        """
+        Get the cached prices if the cached date range includes the requested one.
+
+        Parameters
+        ----------
+        `provider`: str
+            The data provider name.
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+        `start_date`: pd.Timestamp
+            A pd.Timestamp representing start date.
+        `end_date`: pd.Timestamp | None
+            A pd.Timestamp representing end date, None means today.
+        `bars_field`: str
+            A field in the OHLCV bars.
+
+        Returns
+        -------
+        `prices`
+            pd.DataFrame with the prices in the date range or None on cache miss.
+        """
+        cached = self._read_prices(
+            self.get_path("prices", provider, tuple(sorted(tickers)), bars_field)
+        )
+        start, end = self._to_date(start_date), self._to_date(end_date)
+        if cached is None:
+            return None
+        prices, cached_start, cached_end, _ = cached
+        if start < cached_start or end > cached_end:
+            return None
+        dates = pd.to_datetime(prices.index)
+        return prices[(dates >= start) & (dates <= end)]
+
+    def set_prices(
+        self,
+        prices: pd.DataFrame,
+        provider: str,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp | None,
+        bars_field: str,
+    ) -> None:
+        """
+        Cache the prices, merging them with the cached ones when date ranges overlap.
+
+        The covered date range ends at most yesterday, so that requests including
+        today are always fetched from the provider.
+
+        Parameters
+        ----------
+        `prices`: pd.DataFrame
+            The prices fetched from the provider.
+        `provider`: str
+            The data provider name.
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+        `start_date`: pd.Timestamp
+            A pd.Timestamp representing start date.
+        `end_date`: pd.Timestamp | None
+            A pd.Timestamp representing end date, None means today.
+        `bars_field`: str
+            A field in the OHLCV bars.
+        """
+        if prices.empty:
+            return
+        path = self.get_path("prices", provider, tuple(sorted(tickers)), bars_field)
+        start, end = self._to_date(start_date), self._to_date(end_date)
+        # today's bar is not closed yet, so only the dates up to yesterday are covered
+        end = min(end, self._to_date(None) - pd.Timedelta(days=1))
+        if end < start:
+            return
+        fetched_at = time.time()
+        cached = self._read_prices(path)
+        if cached is not None:
+            cached_prices, cached_start, cached_end, cached_fetched_at = cached
+            if start <= cached_end and end >= cached_start:
+                # newly fetched rows take precedence over the cached ones
+                prices = prices.combine_first(cached_prices).sort_index()
+                start, end = min(start, cached_start), max(end, cached_end)
+                fetched_at = min(fetched_at, cached_fetched_at)
+        self._write_table(
+            path,
+            prices,
+            metadata={
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+                "fetched_at": fetched_at,
+            },
+        )
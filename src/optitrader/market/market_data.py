@@ -3,9 +3,11 @@
 import asyncio
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 
 import finnhub
+import numpy as np
 import pandas as pd
 
 from optitrader.config import SETTINGS
@@ -14,13 +16,23 @@ from optitrader.enums.market import BalanceSheetItem, CashFlowItem, IncomeStatem
 from optitrader.market.alpaca_market_data import AlpacaMarketData, Asset
 from optitrader.market.base_data_provider import BaseDataProvider
 from optitrader.market.db.database import MarketDB
+from optitrader.market.disk_cache import DiskCache
 from optitrader.market.finnhub_market_data import FinnhubClient
 from optitrader.market.yahoo_market_data import YahooMarketData
-from optitrader.models.asset import AssetModel, _YahooFinnhubCommon
+from optitrader.models.asset import (
+    AssetModel,
+    FinnhubAssetModel,
+    YahooAssetModel,
+    _YahooFinnhubCommon,
+)
+from optitrader.utils import to_daily_range
 
 logging.basicConfig(level=logging.WARNING)
 log = logging.getLogger(__name__)
 
+PREFETCH_WINDOW = pd.Timedelta(days=30)
+SHARES_CACHE_TTL = pd.Timedelta(hours=1)
+
 
 class MarketData:
     """Class that implements market data connections."""
@@ -33,6 +45,8 @@ class MarketData:
         broker_key: str | None = SETTINGS.ALPACA_BROKER_API_KEY,
         broker_secret: str | None = SETTINGS.ALPACA_BROKER_API_SECRET,
         use_db: bool = True,
+        cache_dir: str | None = SETTINGS.CACHE_DIR,
+        prefetch: bool = False,
     ) -> None:
         self._trading_key = trading_key
         self._trading_secret = trading_secret
@@ -51,11 +65,17 @@ class MarketData:
             DataProvider.YAHOO: self.__yahoo_client,
         }
         self.__provider_client = provider_mapping[data_provider]
+        self._data_provider = data_provider
         self.use_db = use_db
         if self.use_db:
             self._db = MarketDB()
+        self._disk_cache = DiskCache(cache_dir=cache_dir) if cache_dir else None
+        # prefetched prices are only kept in the on-disk cache
+        self.prefetch = prefetch and self._disk_cache is not None
+        if self.prefetch:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=2)
+            self._prefetched: set[tuple] = set()
 
-    @lru_cache  # noqa: B019
     def load_prices(
         self,
         tickers: tuple[str, ...],
@@ -64,7 +84,10 @@ class MarketData:
         bars_field: BarsField = BarsField.CLOSE,
     ) -> pd.DataFrame:
         """
-        Load the prices df from the data provider.
+        Load the prices df from the on-disk cache or from the data provider.
+
+        The dates are widened to whole days before looking up the in-memory cache,
+        so that calls with e.g. `pd.Timestamp.today()` share the same entry.
 
         Parameters
         ----------
@@ -85,12 +108,115 @@ class MarketData:
         `prices`
             pd.DataFrame with market prices.
         """
-        return self.__provider_client.get_prices(
+        start_date, end_date = to_daily_range(start_date, end_date)
+        prices = self._load_prices(
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date,
+            bars_field=bars_field,
+        )
+        if self.prefetch:
+            self._prefetch_adjacent_prices(
+                tickers=tickers,
+                start_date=start_date,
+                end_date=end_date,
+                bars_field=bars_field,
+            )
+        return prices
+
+    @lru_cache(maxsize=32)  # noqa: B019
+    def _load_prices(
+        self,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp | None = None,
+        bars_field: BarsField = BarsField.CLOSE,
+    ) -> pd.DataFrame:
+        """Load the prices df from the on-disk cache or from the data provider."""
+        cache_key = (self._data_provider.value, tickers)
+        # a missing start date means the first available date, that the cache cannot cover
+        disk_cache = self._disk_cache if not pd.isna(start_date) else None
+        if disk_cache:
+            cached = disk_cache.get_prices(
+                *cache_key,
+                start_date=start_date,
+                end_date=end_date,
+                bars_field=bars_field.value,
+            )
+            if cached is not None:
+                return cached
+        prices = self.__provider_client.get_prices(
             tickers=tickers,
             start_date=start_date,
             end_date=end_date,
             bars_field=bars_field,
         )
+        if disk_cache:
+            disk_cache.set_prices(
+                prices,
+                *cache_key,
+                start_date=start_date,
+                end_date=end_date,
+                bars_field=bars_field.value,
+            )
+        return prices
+
+    def _prefetch_adjacent_prices(
+        self,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp | None = None,
+        bars_field: BarsField = BarsField.CLOSE,
+    ) -> None:
+        """
+        Fetch in background the prices before and after the date range into the disk cache.
+
+        Interactive workflows usually request adjacent date ranges next,
+        the disk cache merges the prefetched prices with the ones just loaded.
+        Windows ending in the future are skipped and each window is only submitted once.
+        """
+        windows = [] if pd.isna(start_date) else [(start_date - PREFETCH_WINDOW, start_date)]
+        if end_date is not None and end_date + PREFETCH_WINDOW <= pd.Timestamp.today():
+            windows.append((end_date, end_date + PREFETCH_WINDOW))
+        for window_start, window_end in windows:
+            key = (tickers, window_start, window_end, bars_field)
+            if key in self._prefetched:
+                continue
+            self._prefetched.add(key)
+            self._prefetch_pool.submit(
+                self._prefetch_prices,
+                tickers=tickers,
+                start_date=window_start,
+                end_date=window_end,
+                bars_field=bars_field,
+            )
+
+    def _prefetch_prices(
+        self,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp,
+        bars_field: BarsField = BarsField.CLOSE,
+    ) -> None:
+        """Fetch the prices into the disk cache, failures are only logged."""
+        assert self._disk_cache
+        try:
+            prices = self.__provider_client.get_prices(
+                tickers=tickers,
+                start_date=start_date,
+                end_date=end_date,
+                bars_field=bars_field,
+            )
+            self._disk_cache.set_prices(
+                prices,
+                self._data_provider.value,
+                tickers,
+                start_date=start_date,
+                end_date=end_date,
+                bars_field=bars_field.value,
+            )
+        except Exception as error:
+            log.debug(f"Prefetch of {tickers} from {start_date} to {end_date}: {type(error)}")
 
     def get_total_returns(
         self,
@@ -98,6 +224,7 @@ class MarketData:
         start_date: pd.Timestamp,
         end_date: pd.Timestamp | None = None,
         required_pct_obs: float = 0.95,
+        dtype: str | None = None,
     ) -> pd.DataFrame:
         """
         Return total return dataframe.
@@ -113,21 +240,27 @@ class MarketData:
         `required_pct_obs`: float
             Minimum treshold for non NaNs in each column.
             Columns with more NaNs(%)>required_pct_obs will be dropped.
+        `dtype`: str | None
+            The dtype of the returns, e.g. float32 halves the memory of wide universes.
+            Defaults to None to keep the dtype of the prices.
 
         Returns
         -------
         `returns`
             pd.DataFrame with market linear returns.
         """
-        returns = (
-            self.load_prices(
-                tickers=tickers,
-                start_date=start_date,
-                end_date=end_date,
-            )
-            .pct_change()
-            .iloc[1:, :]
+        prices = self.load_prices(
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date,
         )
+        # a single array for the returns, instead of the pct_change frame and a copy of its slice
+        # missing prices are forward filled like pct_change does, leading NaNs stay NaN
+        values = prices.ffill().to_numpy(dtype=dtype)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns_values = values[1:] / values[:-1]
+        returns_values -= 1
+        returns = pd.DataFrame(returns_values, index=prices.index[1:], columns=prices.columns)
         # remove tickers that do not have enough observations
         return returns.dropna(axis=1, thresh=int(returns.shape[0] * required_pct_obs))
 
@@ -149,7 +282,7 @@ class MarketData:
             return self._db.get_asset(ticker)
         return self.get_asset_from_ticker(ticker)
 
-    @lru_cache  # noqa: B019
+    @lru_cache(maxsize=256)  # noqa: B019
     def get_asset_from_ticker(self, ticker: str) -> AssetModel:
         """
         Return asset info from ticker.
@@ -164,10 +297,20 @@ class MarketData:
         `asset`
             AssetModel data model.
         """
+        return self._to_asset_model(
+            apca_asset=self.__alpaca_client.get_alpaca_asset(ticker),
+            yahoo_asset=self.__yahoo_client.get_yahoo_asset(ticker),
+            finnhub_asset=self.__finnhub.get_asset_profile(ticker) if self.__finnhub else None,
+        )
+
+    @staticmethod
+    def _to_asset_model(
+        apca_asset: Asset,
+        yahoo_asset: YahooAssetModel | None = None,
+        finnhub_asset: FinnhubAssetModel | None = None,
+    ) -> AssetModel:
+        """Merge the assets info from the data providers in a single AssetModel."""
         duplicate_fields = set(_YahooFinnhubCommon.model_fields)
-        apca_asset = self.__alpaca_client.get_alpaca_asset(ticker)
-        finnhub_asset = self.__finnhub.get_asset_profile(ticker) if self.__finnhub else None
-        yahoo_asset = self.__yahoo_client.get_yahoo_asset(ticker)
         return AssetModel(
             **apca_asset.model_dump(exclude_none=True),
             **yahoo_asset.model_dump(
@@ -205,9 +348,25 @@ class MarketData:
             log.debug(type(error))
             return None
 
-    async def _async_get_assets(self, tickers: tuple[str, ...]) -> list[AssetModel]:
+    def _get_finnhub_asset(self, ticker: str) -> FinnhubAssetModel | None:
+        """Return the finnhub asset profile from ticker, None on failure."""
+        if not self.__finnhub:
+            return None
+        try:
+            return self.__finnhub.get_asset_profile(ticker)
+        except Exception as error:
+            log.debug(ticker)
+            log.debug(type(error))
+            return None
+
+    async def _async_get_assets(
+        self, tickers: tuple[str, ...]
+    ) -> tuple[dict[str, Asset], dict[str, YahooAssetModel], list[FinnhubAssetModel | None]]:
         """
-        Return assets info from ticker.
+        Return assets info from each data provider concurrently.
+
+        Alpaca and Yahoo are queried in batch for all the tickers,
+        Finnhub only supports a request per ticker.
 
         Parameters
         ----------
@@ -217,12 +376,69 @@ class MarketData:
         Returns
         -------
         `assets`
-            A list of AssetModel data model.
+            The Alpaca assets and Yahoo assets by ticker and the Finnhub assets list.
+        """
+        apca_assets, yahoo_assets, *finnhub_assets = await asyncio.gather(
+            asyncio.to_thread(self.__alpaca_client.get_multi_alpaca_assets, tickers),
+            asyncio.to_thread(self.__yahoo_client.get_multi_yahoo_assets, tickers),
+            *[asyncio.to_thread(self._get_finnhub_asset, ticker) for ticker in tickers],
+        )
+        return apca_assets, yahoo_assets, finnhub_assets
+
+    async def async_get_asset_from_tickers(
+        self, tickers: tuple[str, ...]
+    ) -> list[AssetModel | None]:
+        """
+        Return asset info for each ticker fetched concurrently.
+
+        Parameters
+        ----------
+        `tickers`: tuple(str)
+            A tuple of str representing the tickers.
+
+        Returns
+        -------
+        `assets`
+            A list of AssetModel data model, None for the tickers that are not found.
         """
         _threads = [asyncio.to_thread(self._get_asset_from_ticker, ticker) for ticker in tickers]
         return await asyncio.gather(*_threads)
 
-    @lru_cache  # noqa: B019
+    def get_assets_from_tickers(self, tickers: tuple[str, ...]) -> list[AssetModel]:
+        """
+        Return assets info from tickers with batched requests to the data providers.
+
+        Parameters
+        ----------
+        `tickers`: tuple(str)
+            A tuple of str representing the tickers.
+
+        Returns
+        -------
+        `assets`
+            A list of AssetModel data model, tickers that are not found are skipped.
+        """
+        apca_assets, yahoo_assets, finnhub_assets = asyncio.run(
+            self._async_get_assets(tickers=tickers)
+        )
+        assets = []
+        for ticker, finnhub_asset in zip(tickers, finnhub_assets, strict=True):
+            if ticker not in apca_assets:
+                continue
+            try:
+                assets.append(
+                    self._to_asset_model(
+                        apca_asset=apca_assets[ticker],
+                        yahoo_asset=yahoo_assets.get(ticker),
+                        finnhub_asset=finnhub_asset,
+                    )
+                )
+            except Exception as error:
+                log.debug(ticker)
+                log.debug(type(error))
+        return assets
+
+    @lru_cache(maxsize=32)  # noqa: B019
     def get_assets_from_provider(self, tickers: tuple[str, ...]) -> list[AssetModel]:
         """
         Return assets info from ticker.
@@ -243,15 +459,15 @@ class MarketData:
         for i in range(0, len(tickers), tickers_bucket_size):
             tickers_bucket = tickers[i : i + tickers_bucket_size]
             try:
-                _new_assets = asyncio.run(self._async_get_assets(tickers=tickers_bucket))
+                _new_assets = self.get_assets_from_tickers(tickers=tickers_bucket)
             except finnhub.FinnhubAPIException as api_error:
                 reset_remaining = 60 - (time.time() - start)
                 log.warning(f"Request for tickers {tickers_bucket} sleeping {reset_remaining}")
                 log.warning(type(api_error))
                 if reset_remaining:
                     time.sleep(reset_remaining)  # wait time limit reset
-                _new_assets = asyncio.run(self._async_get_assets(tickers=tickers_bucket))
-            assets.extend([a for a in _new_assets if a is not None])
+                _new_assets = self.get_assets_from_tickers(tickers=tickers_bucket)
+            assets.extend(_new_assets)
         return assets
 
     def get_assets(self, tickers: tuple[str, ...] | None = None) -> list[AssetModel]:
@@ -295,9 +511,13 @@ class MarketData:
         """
         if self.use_db:
             return self._db.get_assets_df(tickers)
-        return pd.DataFrame([a.model_dump() for a in self.get_assets(tickers)])
+        # the fields are flat, so the models __dict__ are the records without model_dump copies
+        return pd.DataFrame.from_records(
+            [a.__dict__ for a in self.get_assets(tickers)],
+            columns=list(AssetModel.model_fields),
+        )
 
-    @lru_cache  # noqa: B019
+    @lru_cache(maxsize=32)  # noqa: B019
     def get_financials(self, ticker: str) -> pd.DataFrame:
         """
         Return asset info from ticker.
@@ -312,9 +532,58 @@ class MarketData:
         `fin_df`
             pd.DataFrame of financials.
         """
-        return self.__yahoo_client.get_financials(ticker)
+        if self._disk_cache:
+            cached = self._disk_cache.get_frame("financials", ticker)
+            if cached is not None:
+                return cached
+        fin_df = self.__yahoo_client.get_financials(ticker)
+        if self._disk_cache:
+            self._disk_cache.set_frame(fin_df, "financials", ticker)
+        return fin_df
+
+    @lru_cache(maxsize=32)  # noqa: B019
+    def get_multi_financials(self, tickers: tuple[str, ...]) -> pd.DataFrame:
+        """
+        Return the financials of multiple tickers.
+
+        Parameters
+        ----------
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+
+        Returns
+        -------
+        `fin_df`
+            pd.DataFrame of financials indexed by symbol and date.
+        """
+        cache_key = tuple(sorted(tickers))
+        if self._disk_cache:
+            cached = self._disk_cache.get_frame("multi_financials", cache_key)
+            if cached is not None:
+                return cached
+        fin_df = self.__yahoo_client.get_multi_financials(tickers)
+        if self._disk_cache:
+            self._disk_cache.set_frame(fin_df, "multi_financials", cache_key)
+        return fin_df
+
+    async def async_get_financials(self, tickers: tuple[str, ...]) -> dict[str, pd.DataFrame]:
+        """
+        Return the financials of each ticker fetched concurrently.
 
-    @lru_cache  # noqa: B019
+        Parameters
+        ----------
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+
+        Returns
+        -------
+        `financials`
+            A dict of pd.DataFrame of financials by ticker.
+        """
+        _threads = [asyncio.to_thread(self.get_financials, ticker) for ticker in tickers]
+        return dict(zip(tickers, await asyncio.gather(*_threads), strict=True))
+
+    @lru_cache(maxsize=32)  # noqa: B019
     def get_multi_financials_by_item(
         self,
         tickers: tuple[str, ...],
@@ -338,9 +607,17 @@ class MarketData:
         `fin_df`
             pd.DataFrame of financials.
         """
-        return self.__yahoo_client.get_multi_financials_by_item(
+        cache_key = (tuple(sorted(tickers)), financial_item.value)
+        if self._disk_cache:
+            cached = self._disk_cache.get_frame("financials_by_item", *cache_key)
+            if cached is not None:
+                return cached
+        fin_df = self.__yahoo_client.get_multi_financials_by_item(
             tickers, financial_item=financial_item
         )
+        if self._disk_cache:
+            self._disk_cache.set_frame(fin_df, "financials_by_item", *cache_key)
+        return fin_df
 
     def get_tradable_tickers(self) -> tuple[str, ...]:
         """Get all tradable tickers from Alpaca."""
@@ -354,9 +631,24 @@ class MarketData:
         self,
         tickers: tuple[str, ...],
     ) -> pd.Series:
-        """Get the number of shares for each ticket in tickets."""
+        """
+        Get the number of shares for each ticket in tickets.
+
+        The number of shares only changes a few times a year,
+        so it is cached and refetched after SHARES_CACHE_TTL.
+        """
+        ttl_hash = int(time.time() // SHARES_CACHE_TTL.total_seconds())
+        return self._get_total_number_of_shares(tickers, ttl_hash=ttl_hash)
+
+    @lru_cache(maxsize=16)  # noqa: B019
+    def _get_total_number_of_shares(
+        self,
+        tickers: tuple[str, ...],
+        ttl_hash: int,
+    ) -> pd.Series:
+        """Get the number of shares for each ticket in tickets, ttl_hash expires the cache."""
         if self.use_db:
-            return self._db.get_number_of_shares(tickers).set_index("ticker")
+            return self._db.get_number_of_shares(tickers).set_index("ticker")["number_of_shares"]
         return self.__yahoo_client.get_multi_number_of_shares(tickers)
 
     def get_market_caps(
@@ -389,20 +681,39 @@ class MarketData:
             tickers=tickers,
             start_date=start_date,
             end_date=end_date,
-        ).mul(self.get_total_number_of_shares(tickers)["number_of_shares"], axis=1)
+        ).mul(self.get_total_number_of_shares(tickers), axis=1)
 
-    def get_top_market_caps(
+    def get_latest_market_caps(
         self,
         tickers: tuple[str, ...],
-        top: int,
     ) -> pd.Series:
-        """Get the tickers with the top market cap."""
-        caps = self.get_market_caps(
+        """
+        Return the market caps at the last available date.
+
+        Parameters
+        ----------
+        `tickers`: tuple[str, ...]
+            A tuple of str representing the tickers.
+
+        Returns
+        -------
+        `market_caps`
+            pd.Series with the market cap of each ticker.
+        """
+        last_prices = self.load_prices(
             tickers=tickers,
             # only taking last week data for the market cap
             start_date=pd.Timestamp.today() - pd.Timedelta(days=5),
-        )
-        return caps.iloc[-1, :].sort_values(ascending=False)[:top]
+        ).iloc[-1]
+        return last_prices.mul(self.get_total_number_of_shares(tickers))
+
+    def get_top_market_caps(
+        self,
+        tickers: tuple[str, ...],
+        top: int,
+    ) -> pd.Series:
+        """Get the tickers with the top market cap."""
+        return self.get_latest_market_caps(tickers=tickers).sort_values(ascending=False)[:top]
 
     def get_top_market_cap_tickers(
         self,
@@ -0,0 +1,80 @@
+"""HTTP sessions with connection pools shared by the data providers."""
+
+import logging
+import random
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from yahooquery import utils as yahoo_utils
+
+logging.basicConfig(level=logging.WARNING)
+log = logging.getLogger(__name__)
+
+# yahooquery only sets these up on the sessions it creates itself,
+# they are not part of its public API so they are read with a fallback
+_YAHOO_ADAPTER: type[HTTPAdapter] = getattr(yahoo_utils, "TimeoutHTTPAdapter", HTTPAdapter)
+_YAHOO_HEADERS: dict[str, str] = dict(getattr(yahoo_utils, "headers", {"accept": "*/*"}))
+_YAHOO_USER_AGENTS: list[str] = list(getattr(yahoo_utils, "USER_AGENT_LIST", []))
+
+
+def mount_pool(
+    client: object,
+    pool_connections: int,
+    pool_maxsize: int,
+    max_retries: Retry | int = 0,
+    adapter_class: type[HTTPAdapter] = HTTPAdapter,
+) -> bool:
+    """
+    Mount an adapter with a connection pool for the https requests of a session.
+
+    Parameters
+    ----------
+    `client`: object
+        A requests Session, or a client keeping one in its `_session` attribute like alpaca-py.
+    `pool_connections`: int
+        The number of hosts with a connection pool.
+    `pool_maxsize`: int
+        The maximum number of connections in each pool.
+    `max_retries`: Retry | int
+        The retries of each request. Defaults to 0.
+    `adapter_class`: type[HTTPAdapter]
+        The class of the adapter. Defaults to HTTPAdapter.
+
+    Returns
+    -------
+    `mounted`
+        Whether the client has a session to mount the adapter on.
+    """
+    session = client if isinstance(client, Session) else getattr(client, "_session", None)
+    if not isinstance(session, Session):
+        log.debug(f"{type(client)} has no requests session to mount a pool on.")
+        return False
+    session.mount(
+        "https://",
+        adapter_class(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        ),
+    )
+    return True
+
+
+def init_yahoo_session(session: Session) -> Session:
+    """Set up the headers, connection pool and retries that yahooquery uses on a session."""
+    mount_pool(
+        session,
+        pool_connections=20,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+        adapter_class=_YAHOO_ADAPTER,
+    )
+    session.headers.update(_YAHOO_HEADERS)
+    if _YAHOO_USER_AGENTS:
+        session.headers["User-Agent"] = random.choice(_YAHOO_USER_AGENTS)
+    return session
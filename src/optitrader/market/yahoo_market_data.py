@@ -3,16 +3,23 @@
 import logging
 from functools import lru_cache
 
+import numpy as np
 import pandas as pd
+from requests import Session
+from requests_futures.sessions import FuturesSession
 from yahooquery import Ticker
 
 from optitrader.enums.market import BalanceSheetItem, BarsField, CashFlowItem, IncomeStatementItem
 from optitrader.market.base_data_provider import BaseDataProvider
+from optitrader.market.sessions import init_yahoo_session
 from optitrader.models.asset import YahooAssetModel
+from optitrader.utils import to_daily_range
 
 logging.basicConfig(level=logging.WARNING)
 log = logging.getLogger(__name__)
 
+ASSET_MODULES = ["assetProfile", "defaultKeyStatistics"]
+
 
 class YahooMarketData(BaseDataProvider):
     """Class to get market data from Yahoo."""
@@ -24,6 +31,10 @@ class YahooMarketData(BaseDataProvider):
             *CashFlowItem.get_values_list(),
             *BalanceSheetItem.get_values_list(),
         ]
+        # the sessions are shared by all the Ticker instances to reuse the connections,
+        # yahooquery makes asynchronous requests only with a FuturesSession
+        self._session = init_yahoo_session(Session())
+        self._async_session = init_yahoo_session(FuturesSession(max_workers=20))
 
     def parse_ticker_for_yahoo(self, ticker: str) -> str:
         """Replace a dot with a hyphen for yahoo in ticker."""
@@ -37,7 +48,6 @@ class YahooMarketData(BaseDataProvider):
         """Replace a dot with a hyphen for yahoo in tickers."""
         return tuple(self.parse_ticker_for_yahoo(t) for t in tickers)
 
-    @lru_cache  # noqa: B019
     def get_bars(
         self,
         tickers: tuple[str, ...],
@@ -61,8 +71,19 @@ class YahooMarketData(BaseDataProvider):
         `bars`
             a pd.DataFrame with the bars for the tickers.
         """
+        start_date, end_date = to_daily_range(start_date, end_date)
+        return self._get_bars(tickers=tickers, start_date=start_date, end_date=end_date)
+
+    @lru_cache(maxsize=32)  # noqa: B019
+    def _get_bars(
+        self,
+        tickers: tuple[str, ...],
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Get the daily bars dataframe from yahooquery, cached by whole days."""
         return Ticker(
-            symbols=sorted(self.parse_tickers_for_yahoo(tickers)), asynchronous=True
+            symbols=sorted(self.parse_tickers_for_yahoo(tickers)), session=self._async_session
         ).history(start=start_date, end=end_date, adj_ohlc=True)
 
     def get_prices(
@@ -94,60 +115,97 @@ class YahooMarketData(BaseDataProvider):
             start_date=start_date,
             end_date=end_date,
         )
-        bars.reset_index(inplace=True)
-        _index_name = "date"
-        return bars.pivot(index=_index_name, columns="symbol", values=bars_field)
+        # bars are indexed by (symbol, date), unstacking avoids a long-format pivot
+        return bars[bars_field.value].unstack(level="symbol")
+
+    @staticmethod
+    def _to_yahoo_asset(modules: dict) -> YahooAssetModel:
+        """Get the asset model from the assetProfile and defaultKeyStatistics modules."""
+        _profile = modules["assetProfile"]
+        _stats = modules.get("defaultKeyStatistics")
+        return YahooAssetModel(
+            **_profile,
+            business_summary=_profile.get("longBusinessSummary"),
+            number_of_shares=_stats.get("sharesOutstanding") if isinstance(_stats, dict) else None,
+        )
 
     def get_yahoo_asset(self, ticker: str, fail_on_yf_error: bool = False) -> YahooAssetModel:
         """Get asset info from yahoo."""
         ticker = self.parse_ticker_for_yahoo(ticker)
+        _modules = None
         try:
-            _ticker = Ticker(ticker)
-            _profile = _ticker.asset_profile
+            # the profile and the key stats are queried together
+            _modules = Ticker(ticker, session=self._session).get_modules(ASSET_MODULES)
+            _modules = _modules.get(ticker) if isinstance(_modules, dict) else _modules
             if fail_on_yf_error:
-                assert isinstance(_profile, dict), f"Yahoo query returned {_profile}"
-            elif _profile is None or isinstance(_profile, str):
+                assert isinstance(_modules, dict), f"Yahoo query returned {_modules}"
+            elif not isinstance(_modules, dict):
                 # create empty model with None
                 return YahooAssetModel()
-            elif isinstance(_profile, dict):
-                _profile = _ticker.asset_profile[ticker]
-            return YahooAssetModel(
-                **_profile,
-                business_summary=_profile["longBusinessSummary"],
-                number_of_shares=_ticker.key_stats[ticker]["sharesOutstanding"],
-            )
+            return self._to_yahoo_asset(_modules)
         except Exception as exc:
             log.debug(f"{ticker}: {type(exc)}")
             if fail_on_yf_error:
-                raise AssertionError(f"Yahoo query returned {_profile}") from exc
+                raise AssertionError(f"Yahoo query returned {_modules}") from exc
             return YahooAssetModel()
 
+    def get_multi_yahoo_assets(self, tickers: tuple[str, ...]) -> dict[str, YahooAssetModel]:
+        """Get assets info from yahoo with a single query for all the tickers."""
+        try:
+            modules = Ticker(
+                symbols=sorted(self.parse_tickers_for_yahoo(tickers)),
+                session=self._async_session,
+            ).get_modules(ASSET_MODULES)
+        except Exception as exc:
+            # create empty models with None for all the tickers
+            log.debug(f"{tickers}: {type(exc)}")
+            modules = None
+        assets = {}
+        for ticker in tickers:
+            y_ticker = self.parse_ticker_for_yahoo(ticker)
+            _modules = modules.get(y_ticker) if isinstance(modules, dict) else None
+            try:
+                assets[ticker] = (
+                    self._to_yahoo_asset(_modules)
+                    if isinstance(_modules, dict)
+                    else YahooAssetModel()
+                )
+            except Exception as exc:
+                log.debug(f"{ticker}: {type(exc)}")
+                assets[ticker] = YahooAssetModel()
+        return assets
+
     def get_number_of_shares(self, ticker: str) -> int:
         """Get the sharesOutstanding field from yahoo query."""
-        yf_stats = Ticker(self.parse_ticker_for_yahoo(ticker)).key_stats
+        yf_stats = Ticker(self.parse_ticker_for_yahoo(ticker), session=self._session).key_stats
         _shares = yf_stats.get(ticker, None)
         return int(_shares["sharesOutstanding"]) if isinstance(_shares, dict) else 0
 
     def get_multi_number_of_shares(self, tickers: tuple[str, ...]) -> pd.Series:
         """Get the sharesOutstanding field from yahoo query."""
         tickers = self.parse_tickers_for_yahoo(tickers)
-        y_tickers = Ticker(symbols=sorted(tickers), asynchronous=True, max_workers=10)
+        # each access to key_stats queries yahoo, so it is only accessed once
+        stats = Ticker(symbols=sorted(tickers), session=self._async_session).key_stats
+        stats = stats if isinstance(stats, dict) else {}
+        shares = np.fromiter(
+            (
+                (_stats.get("sharesOutstanding") or 0) if isinstance(_stats, dict) else 0
+                for _stats in (stats.get(ticker) for ticker in tickers)
+            ),
+            dtype=np.int64,
+            count=len(tickers),
+        )
         return pd.Series(
-            {
-                self.parse_ticker_from_yahoo(ticker): int(
-                    y_tickers.key_stats[ticker]["sharesOutstanding"]
-                )
-                if isinstance(y_tickers.key_stats.get(ticker, None), dict)
-                else 0
-                for ticker in tickers
-            }
+            shares,
+            index=[self.parse_ticker_from_yahoo(ticker) for ticker in tickers],
+            name="number_of_shares",
         )
 
-    @lru_cache  # noqa: B019
+    @lru_cache(maxsize=32)  # noqa: B019
     def get_financials(self, ticker: str) -> pd.DataFrame:
         """Get financials from yahoo finance."""
         ticker = self.parse_ticker_for_yahoo(ticker)
-        fin_df = Ticker(ticker).get_financial_data(
+        fin_df = Ticker(ticker, session=self._session).get_financial_data(
             types=self.financials,
             frequency="q",
             trailing=False,
@@ -156,7 +214,29 @@ class YahooMarketData(BaseDataProvider):
         fin_df = fin_df.reset_index().set_index("asOfDate")
         return fin_df[self.financials]
 
-    @lru_cache  # noqa: B019
+    @lru_cache(maxsize=32)  # noqa: B019
+    def get_multi_financials(
+        self,
+        tickers: tuple[str, ...],
+        frequency: str = "q",
+    ) -> pd.DataFrame:
+        """Get financials from yahoo finance with a single query for all the tickers."""
+        fin_df = Ticker(
+            symbols=sorted(self.parse_tickers_for_yahoo(tickers)),
+            session=self._async_session,
+        ).get_financial_data(
+            types=self.financials,
+            frequency=frequency,
+            trailing=False,
+        )
+        if not isinstance(fin_df, pd.DataFrame):
+            return pd.DataFrame()
+        fin_df = fin_df.reset_index()
+        fin_df["symbol"] = fin_df["symbol"].map(self.parse_ticker_from_yahoo)
+        # some items might not be reported by any of the tickers
+        return fin_df.set_index(["symbol", "asOfDate"]).reindex(columns=self.financials)
+
+    @lru_cache(maxsize=32)  # noqa: B019
     def get_multi_financials_by_item(
         self,
         tickers: tuple[str, ...],
@@ -166,7 +246,7 @@ class YahooMarketData(BaseDataProvider):
     ) -> pd.DataFrame:
         """Get financials from yahoo finance."""
         tickers = self.parse_tickers_for_yahoo(tickers)
-        fin_df = Ticker(tickers).get_financial_data(
+        fin_df = Ticker(tickers, session=self._session).get_financial_data(
             types=[financial_item],
             frequency="q",
             trailing=False,
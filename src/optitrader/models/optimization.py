@@ -3,6 +3,7 @@
 
 from collections import OrderedDict
 from datetime import date, datetime, timedelta
+from typing import ClassVar
 
 from pydantic import Field
 
@@ -25,7 +26,8 @@ from optitrader.optimization.objectives import (
 class ObjectiveModel(BaseModel):
     """Objective model for the opt request."""
 
-    _obj_map: ObjectivesMap = ObjectivesMap()
+    # class variables are shared by the instances, unlike private attributes which are copied
+    _obj_map: ClassVar[ObjectivesMap] = ObjectivesMap()
     name: ObjectiveName
     weight: float
 
@@ -37,12 +39,18 @@ class ObjectiveModel(BaseModel):
 class ConstraintModel(BaseModel):
     """Constraint model for the opt request."""
 
-    _constr_map: ConstraintsMap = ConstraintsMap()
+    _constr_map: ClassVar[ConstraintsMap] = ConstraintsMap()
     name: ConstraintName
+    lower_bound: int | None = None
+    upper_bound: int | None = None
 
     def to_ptf_constraint(self) -> PortfolioConstraint:
         """Parse to constraint."""
-        return self._constr_map.to_constraint(self.name)
+        return self._constr_map.to_constraint(
+            self.name,
+            lower_bound=self.lower_bound,
+            upper_bound=self.upper_bound,
+        )
 
 
 class OptimizationRequest(BaseModel):
@@ -54,7 +62,7 @@ class OptimizationRequest(BaseModel):
     end_date: date = datetime.utcnow().date() - timedelta(days=1)
     objectives: list[ObjectiveModel]
     constraints: list[ConstraintModel] = Field(
-        default=[
+        default_factory=lambda: [
             ConstraintModel(name=ConstraintName.SUM_TO_ONE),
             ConstraintModel(name=ConstraintName.LONG_ONLY),
         ]
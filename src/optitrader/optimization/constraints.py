@@ -1,5 +1,6 @@
 """Objectives."""
 from abc import ABCMeta, abstractmethod
+from collections.abc import Callable
 
 import cvxpy as cp
 
@@ -88,6 +89,9 @@ class NumberOfAssetsConstraint(BoundedConstraint):
 
     def get_constraints_list(self, weights_variable: cp.Variable) -> list[cp.Constraint]:
         """Get sum to one constraint matrices."""
+        if self.lower_bound is None and self.upper_bound is None:
+            # without bounds the boolean variables would only make the problem mixed-integer
+            return []
         w_bool = cp.Variable(weights_variable.shape, boolean=True)
         constraints = [weights_variable - w_bool <= 0]
         if self.lower_bound is not None:
@@ -135,11 +139,12 @@ class ConstraintsMap:
         constraints: list[PortfolioConstraint] | None = None,
         constraint_names: list[ConstraintName] | None = None,
     ) -> None:
-        self.constraint_mapping: dict[ConstraintName, UnboundedConstraint | BoundedConstraint] = {
-            ConstraintName.SUM_TO_ONE: SumToOneConstraint(),
-            ConstraintName.LONG_ONLY: NoShortSellConstraint(),
-            ConstraintName.NUMER_OF_ASSETS: NumberOfAssetsConstraint(),
-            ConstraintName.WEIGHTS_PCT: WeightsConstraint(),
+        # constraints are instantiated on demand, so that their bounds are not shared
+        self.constraint_mapping: dict[ConstraintName, Callable[..., PortfolioConstraint]] = {
+            ConstraintName.SUM_TO_ONE: SumToOneConstraint,
+            ConstraintName.LONG_ONLY: NoShortSellConstraint,
+            ConstraintName.NUMER_OF_ASSETS: NumberOfAssetsConstraint,
+            ConstraintName.WEIGHTS_PCT: WeightsConstraint,
         }
         self.constraints: list[PortfolioConstraint] = (
             constraints or [self.to_constraint(name) for name in constraint_names]
@@ -160,14 +165,11 @@ class ConstraintsMap:
     ) -> PortfolioConstraint:
         """Get a constraint."""
         if name.is_bounded:
-            constr = self.constraint_mapping[name]
-            assert isinstance(constr, BoundedConstraint)
-            constr.set_bounds(
+            return self.constraint_mapping[name](
                 lower_bound=lower_bound,
                 upper_bound=upper_bound,
             )
-            return constr
-        return self.constraint_mapping[name]
+        return self.constraint_mapping[name]()
 
     def reset_constraint_names(self, constraint_names: list[ConstraintName]) -> None:
         """Reset the constraint names based on the chosen ones in streamlit."""
@@ -205,7 +207,7 @@ class ConstraintsMap:
         """Return the constraint docstring."""
         return (
             self.constraint_mapping[name].__doc__
-            or f"{self.constraint_mapping[name].__class__.__name__} documentation."
+            or f"{self.constraint_mapping[name].__name__} documentation."
         )
 
     def set_constraint_bounds(
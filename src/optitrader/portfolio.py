@@ -1,5 +1,8 @@
 """Portfolio module."""
 
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objs as go
@@ -10,6 +13,7 @@ from optitrader.config import SETTINGS
 from optitrader.market import MarketData
 from optitrader.models import AssetModel
 from optitrader.optimization.objectives import ObjectiveValue
+from optitrader.utils import to_daily_range
 
 
 class Portfolio:
@@ -46,6 +50,20 @@ class Portfolio:
             return f"{self.__class__.__name__}(weights={self.get_non_zero_weights().to_dict()}, objective_values={objectives_dict})"
         return f"{self.__class__.__name__}(weights={self.get_non_zero_weights().to_dict()}"
 
+    def __hash__(self) -> int:
+        """Hash of the weights, so that equal portfolios share cache entries."""
+        # the bytes of float64 weights without negative zeros, like the values compared in __eq__
+        weights = self.weights.to_numpy(dtype=np.float64) + 0.0
+        return hash((tuple(self.weights.index), weights.tobytes()))
+
+    def __eq__(self, other: object) -> bool:
+        """Two portfolios are equal if they have the same weights."""
+        if not isinstance(other, Portfolio):
+            return NotImplemented
+        return self.weights.index.equals(other.weights.index) and np.array_equal(
+            self.weights.to_numpy(), other.weights.to_numpy()
+        )
+
     def get_non_zero_weights(self, round_to_decimal: int | None = 5) -> pd.Series:
         """Non zero weights."""
         non_zero = self.weights[self.weights != 0]
@@ -56,9 +74,9 @@ class Portfolio:
         weights = self.get_non_zero_weights() if only_non_zero else self.weights
         return tuple(weights.keys())
 
-    @typechecked
     def set_market_data(self, market_data: MarketData) -> None:
         """Set the market data."""
+        assert isinstance(market_data, MarketData), "The market data must be a MarketData."
         self.market_data = market_data
 
     def get_assets_in_portfolio(self, only_non_zero: bool = True) -> list[AssetModel]:
@@ -66,13 +84,22 @@ class Portfolio:
         assert isinstance(
             self.market_data, MarketData
         ), "You must set the market data to get the assets info."
+        return self._get_assets_in_portfolio(self.market_data, only_non_zero)
+
+    @lru_cache(maxsize=16)  # noqa: B019
+    def _get_assets_in_portfolio(
+        self,
+        market_data: MarketData,
+        only_non_zero: bool = True,
+    ) -> list[AssetModel]:
+        """Return the assets in the portfolio, cached by weights and market data."""
         weights = self.get_non_zero_weights() if only_non_zero else self.weights
-        assets = self.market_data.get_assets(tickers=tuple(weights.keys()))
-        assets_in_ptf = []
-        for asset in assets:
-            asset.weight_in_ptf = weights.get(asset.ticker)
-            assets_in_ptf.append(asset)
-        return assets_in_ptf
+        assets = market_data.get_assets(tickers=tuple(weights.keys()))
+        # copy the assets since they might be shared with other portfolios by the market data cache
+        return [
+            asset.model_copy(update={"weight_in_ptf": weights.get(asset.ticker)})
+            for asset in assets
+        ]
 
     def get_assets_df(self) -> pd.DataFrame:
         """Return the assets in the portfolio."""
@@ -115,12 +142,26 @@ class Portfolio:
         assert isinstance(
             self.market_data, MarketData
         ), "You must set the market data to get the assets info."
-        rets = self.market_data.get_total_returns(
+        start_date, end_date = to_daily_range(start_date, end_date)
+        return self._get_history(self.market_data, start_date, end_date)
+
+    @lru_cache(maxsize=16)  # noqa: B019
+    def _get_history(
+        self,
+        market_data: MarketData,
+        start_date: pd.Timestamp,
+        end_date: pd.Timestamp | None = None,
+    ) -> pd.Series:
+        """Get the portfolio wealth history, cached by weights, market data and dates."""
+        rets = market_data.get_total_returns(
             tickers=self.get_tickers(),
             start_date=start_date,
             end_date=end_date,
         )
-        return 1 + (rets * self.get_non_zero_weights()).sum(axis=1, skipna=True).cumsum()
+        # missing returns and tickers not in the portfolio contribute nothing to the sum
+        weights = self.weights.reindex(rets.columns, fill_value=0).to_numpy()
+        wealth = 1 + np.nan_to_num(rets.to_numpy()).dot(weights).cumsum()
+        return pd.Series(wealth, index=rets.index)
 
     def pie_plot(self, title: str = "Portfolio Allocation") -> go.Figure:
         """
@@ -1,8 +1,14 @@
 """Init."""
-from optitrader.utils.utils import clean_string, rearrange_columns_by_zeros, remove_punctuation
+from optitrader.utils.utils import (
+    clean_string,
+    rearrange_columns_by_zeros,
+    remove_punctuation,
+    to_daily_range,
+)
 
 __all__ = [
     "clean_string",
     "remove_punctuation",
     "rearrange_columns_by_zeros",
+    "to_daily_range",
 ]
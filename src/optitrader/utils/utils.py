@@ -14,6 +14,34 @@ def clean_string(string: str) -> str:
     return string.replace("_", " ").replace("-", " ")
 
 
+def to_daily_range(
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp | None = None,
+) -> tuple[pd.Timestamp, pd.Timestamp | None]:
+    """
+    Widen a date range to whole days.
+
+    Daily bars are the same for any time within a day, so flooring the start date
+    and ceiling the end date lets calls with different times share a cache entry.
+
+    Parameters
+    ----------
+    `start_date`: pd.Timestamp
+        The starting date.
+    `end_date`: pd.Timestamp | None
+        The ending date, None is left as is.
+
+    Returns
+    -------
+    `date_range`: tuple[pd.Timestamp, pd.Timestamp | None]
+        The start date at midnight and the end date at the following midnight.
+    """
+    return (
+        pd.Timestamp(start_date).floor("D"),
+        pd.Timestamp(end_date).ceil("D") if end_date is not None else None,
+    )
+
+
 def rearrange_columns_by_zeros(df: pd.DataFrame) -> pd.DataFrame:
     """
     Rearranges the columns of a DataFrame based on the number of zeros in each column.
@@ -146,6 +146,7 @@ def test_run_optimization(
     # (might need refactor with hipothesis)
 
     session_manager._opt_ptf = None  # manually make sure the cache is not there
+    session_manager.start_date = Timestamp("2021-12-10")  # the start of the recorded bars
     session_manager.run_optimization()
 
     st.button.assert_called_once_with(label="COMPUTE OPTIMAL PORTFOLIO")
@@ -224,6 +225,7 @@ def test_display_trader_portfolio(session_manager: SessionManager) -> None:
     """Test for the display_trader_portfolio method of SessionManager class."""
     st.metric = Mock()
     st.dataframe = Mock()
+    session_manager.start_date = Timestamp("2021-12-10")  # the start of the recorded bars
 
     session_manager.display_trader_portfolio()
 
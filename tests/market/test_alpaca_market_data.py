@@ -1,9 +1,13 @@
 """Test market_data module."""
+from unittest.mock import Mock, patch
+
 import pandas as pd
 import pytest
 import vcr
+from alpaca.common.exceptions import APIError
+from alpaca.data import BarSet
 
-from optitrader.market.alpaca_market_data import AlpacaMarketData, Asset
+from optitrader.market.alpaca_market_data import BARS_CACHE_TTL, AlpacaMarketData, Asset
 
 alpaca_market_data = AlpacaMarketData()
 
@@ -51,3 +55,115 @@ def test_get_prices(
     )
     assert isinstance(prices, pd.DataFrame)
     assert sorted(prices.columns) == sorted(test_tickers)
+
+
+def test_get_multi_alpaca_assets() -> None:
+    """Test get_multi_alpaca_assets method."""
+    asset = Mock(spec=Asset)
+
+    def _get_alpaca_asset(ticker: str) -> Asset:
+        if ticker == "INVALID":
+            raise APIError("asset not found")
+        if ticker == "TIMEOUT":
+            raise ConnectionError
+        return asset
+
+    with patch.object(alpaca_market_data, "get_alpaca_asset", side_effect=_get_alpaca_asset):
+        assets = alpaca_market_data.get_multi_alpaca_assets(tickers=("AAPL", "INVALID", "TIMEOUT"))
+    assert assets == {"AAPL": asset}
+
+
+def _bar_set(closes_by_symbol: dict[str, tuple[float, ...]]) -> BarSet:
+    """Make a bar set with daily bars from 2023-01-03."""
+    return BarSet(
+        raw_data={
+            symbol: [
+                {
+                    "t": f"2023-01-0{day}T05:00:00Z",
+                    "o": 1.0,
+                    "h": 1.0,
+                    "l": 1.0,
+                    "c": close,
+                    "v": 1,
+                    "n": 1,
+                    "vw": 1.0,
+                }
+                for day, close in enumerate(closes, start=3)
+            ]
+            for symbol, closes in closes_by_symbol.items()
+        }
+    )
+
+
+def test_get_prices_from_bar_set() -> None:
+    """Test get_prices reads the bars field from the bar set."""
+    client = AlpacaMarketData()
+    bar_set = _bar_set({"MSFT": (3.0, 4.0), "AAPL": (1.0, 2.0)})
+    with patch.object(client, "get_bar_set", return_value=bar_set):
+        prices = client.get_prices(
+            tickers=("AAPL", "MSFT"),
+            start_date=pd.Timestamp("2023-01-01"),
+            end_date=pd.Timestamp("2023-01-10"),
+        )
+    assert list(prices.columns) == ["AAPL", "MSFT"]
+    assert list(prices.index) == ["2023-01-03", "2023-01-04"]
+    assert prices.index.name == "timestamp"
+    assert prices.to_dict("list") == {"AAPL": [1.0, 2.0], "MSFT": [3.0, 4.0]}
+
+
+def test_get_daily_bars_cache() -> None:
+    """Test only the tickers without cached bars for the date range are requested."""
+    client = AlpacaMarketData()
+    start_date, end_date = pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-10")
+    with patch.object(
+        client, "get_bar_set", return_value=_bar_set({"AAPL": (1.0, 2.0, 3.0)})
+    ) as mock_bar_set:
+        client.get_daily_bars(tickers=("AAPL",), start_date=start_date, end_date=end_date)
+        bars = client.get_daily_bars(
+            tickers=("AAPL",), start_date=pd.Timestamp("2023-01-04"), end_date=end_date
+        )
+        mock_bar_set.assert_called_once()
+        assert bars["AAPL"]["close"].to_list() == [2.0, 3.0]
+        mock_bar_set.return_value = _bar_set({"MSFT": (4.0, 5.0, 6.0)})
+        bars = client.get_daily_bars(
+            tickers=("AAPL", "MSFT"), start_date=start_date, end_date=end_date
+        )
+    assert mock_bar_set.call_args.kwargs["tickers"] == ("MSFT",)
+    assert bars["AAPL"]["close"].to_list() == [1.0, 2.0, 3.0]
+    assert bars["MSFT"]["close"].to_list() == [4.0, 5.0, 6.0]
+
+
+@pytest.mark.parametrize("start_date", [None, pd.NaT, pd.Timestamp("2010-01-01")])
+def test_get_daily_bars_first_available_date(start_date: pd.Timestamp | None) -> None:
+    """Test a missing start date gets the bars from the first available date."""
+    client = AlpacaMarketData()
+    with patch.object(
+        client, "get_bar_set", return_value=_bar_set({"AAPL": (1.0, 2.0)})
+    ) as mock_bar_set:
+        bars = client.get_daily_bars(
+            tickers=("AAPL",), start_date=start_date, end_date=pd.Timestamp("2023-01-10")
+        )
+        client.get_daily_bars(
+            tickers=("AAPL",),
+            start_date=pd.Timestamp("2023-01-01"),
+            end_date=pd.Timestamp("2023-01-10"),
+        )
+    mock_bar_set.assert_called_once()
+    assert bars["AAPL"]["close"].to_list() == [1.0, 2.0]
+
+
+def test_get_daily_bars_cache_expired() -> None:
+    """Test the cached bars are requested again after BARS_CACHE_TTL."""
+    client = AlpacaMarketData()
+    start_date, end_date = pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-10")
+    with patch.object(
+        client, "get_bar_set", return_value=_bar_set({"AAPL": (1.0, 2.0)})
+    ) as mock_bar_set:
+        client.get_daily_bars(tickers=("AAPL",), start_date=start_date, end_date=end_date)
+        start, end, frame, fetched_at = client._bar_cache["AAPL"]
+        client._bar_cache["AAPL"] = (start, end, frame, fetched_at - BARS_CACHE_TTL)
+        mock_bar_set.return_value = _bar_set({"AAPL": (3.0, 4.0)})
+        bars = client.get_daily_bars(tickers=("AAPL",), start_date=start_date, end_date=end_date)
+    assert mock_bar_set.call_count == 2  # noqa: PLR2004
+    assert bars["AAPL"]["close"].to_list() == [3.0, 4.0]
+    assert client._bar_cache["AAPL"][3] > fetched_at
@@ -0,0 +1,110 @@
+"""Test disk_cache module."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from optitrader.market.disk_cache import DiskCache
+
+_tickers = ("AAPL", "MSFT")
+
+
+def _prices(start: str, end: str) -> pd.DataFrame:
+    index = pd.date_range(start, end).strftime("%Y-%m-%d")
+    return pd.DataFrame({t: range(len(index)) for t in _tickers}, index=index, dtype=float)
+
+
+def test_get_prices_cache_miss(tmp_path: Path) -> None:
+    """Test get_prices without cached prices."""
+    cache = DiskCache(cache_dir=tmp_path)
+    prices = cache.get_prices("ALPACA", _tickers, pd.Timestamp("2023-01-01"), None, "close")
+    assert prices is None
+
+
+def test_set_and_get_prices(tmp_path: Path) -> None:
+    """Test prices are sliced from the cached date range."""
+    cache = DiskCache(cache_dir=tmp_path)
+    start, end = pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-31")
+    cache.set_prices(_prices("2023-01-01", "2023-01-31"), "ALPACA", _tickers, start, end, "close")
+    prices = cache.get_prices(
+        "ALPACA", _tickers[::-1], pd.Timestamp("2023-01-10"), pd.Timestamp("2023-01-20"), "close"
+    )
+    assert isinstance(prices, pd.DataFrame)
+    assert sorted(prices.columns) == sorted(_tickers)
+    assert prices.index[0] == "2023-01-10"
+    assert prices.index[-1] == "2023-01-20"
+    assert cache.get_prices("ALPACA", _tickers, start, pd.Timestamp("2023-02-10"), "close") is None
+    assert cache.get_prices("YAHOO", _tickers, start, end, "close") is None
+
+
+def test_set_prices_merges_overlapping_ranges(tmp_path: Path) -> None:
+    """Test overlapping date ranges are merged in the same file."""
+    cache = DiskCache(cache_dir=tmp_path)
+    cache.set_prices(
+        _prices("2023-01-01", "2023-01-31"),
+        "ALPACA",
+        _tickers,
+        pd.Timestamp("2023-01-01"),
+        pd.Timestamp("2023-01-31"),
+        "close",
+    )
+    cache.set_prices(
+        _prices("2023-01-15", "2023-02-15"),
+        "ALPACA",
+        _tickers,
+        pd.Timestamp("2023-01-15"),
+        pd.Timestamp("2023-02-15"),
+        "close",
+    )
+    prices = cache.get_prices(
+        "ALPACA", _tickers, pd.Timestamp("2023-01-01"), pd.Timestamp("2023-02-15"), "close"
+    )
+    assert isinstance(prices, pd.DataFrame)
+    assert len(prices) == len(pd.date_range("2023-01-01", "2023-02-15"))
+
+
+def test_set_prices_covers_up_to_yesterday(tmp_path: Path) -> None:
+    """Test today's prices are not cached as covered."""
+    cache = DiskCache(cache_dir=tmp_path)
+    today = pd.Timestamp.today().normalize()
+    start = today - pd.Timedelta(days=10)
+    prices = _prices(str(start.date()), str(today.date()))
+    cache.set_prices(prices, "ALPACA", _tickers, start, None, "close")
+    assert cache.get_prices("ALPACA", _tickers, start, None, "close") is None
+    yesterday = today - pd.Timedelta(days=1)
+    cached = cache.get_prices("ALPACA", _tickers, start, yesterday, "close")
+    assert isinstance(cached, pd.DataFrame)
+    assert cached.index[-1] == str(yesterday.date())
+    cache.set_prices(prices.iloc[-1:], "YAHOO", _tickers, today, today, "close")
+    assert not cache.get_path("prices", "YAHOO", tuple(sorted(_tickers)), "close").exists()
+
+
+def test_expired_frame(tmp_path: Path) -> None:
+    """Test cached frames older than max_age are ignored."""
+    df = _prices("2023-01-01", "2023-01-31")
+    DiskCache(cache_dir=tmp_path).set_frame(df, "financials", "AAPL")
+    assert isinstance(DiskCache(cache_dir=tmp_path).get_frame("financials", "AAPL"), pd.DataFrame)
+    expired = DiskCache(cache_dir=tmp_path, max_age=pd.Timedelta(seconds=-1))
+    assert expired.get_frame("financials", "AAPL") is None
+
+
+def test_merged_prices_expire_with_oldest_fetch(tmp_path: Path) -> None:
+    """Test merging new prices does not extend the age of the cached ones."""
+    cache = DiskCache(cache_dir=tmp_path, max_age=pd.Timedelta(hours=1))
+    start, end = pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-31")
+    prices = _prices("2023-01-01", "2023-01-31")
+    with patch("optitrader.market.disk_cache.time.time", return_value=0.0):
+        cache.set_prices(prices, "ALPACA", _tickers, start, end, "close")
+    with patch("optitrader.market.disk_cache.time.time", return_value=1800.0):
+        cache.set_prices(
+            _prices("2023-01-15", "2023-02-15"),
+            "ALPACA",
+            _tickers,
+            pd.Timestamp("2023-01-15"),
+            pd.Timestamp("2023-02-15"),
+            "close",
+        )
+        assert isinstance(cache.get_prices("ALPACA", _tickers, start, end, "close"), pd.DataFrame)
+    with patch("optitrader.market.disk_cache.time.time", return_value=3601.0):
+        assert cache.get_prices("ALPACA", _tickers, start, end, "close") is None
@@ -1,8 +1,10 @@
 """Test market_data module."""
 
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import finnhub
+import numpy as np
 import pandas as pd
 import pytest
 import vcr
@@ -10,8 +12,11 @@ from alpaca.trading import Asset as AlpacaAsset
 
 from optitrader.enums import UniverseName
 from optitrader.market import InvestmentUniverse, MarketData
+from optitrader.market.alpaca_market_data import AlpacaMarketData
 from optitrader.market.base_data_provider import BaseDataProvider
 from optitrader.market.db.database import MarketDB
+from optitrader.market.market_data import PREFETCH_WINDOW, SHARES_CACHE_TTL
+from optitrader.market.yahoo_market_data import YahooMarketData
 from optitrader.models import AssetModel
 
 my_vcr = vcr.VCR(
@@ -71,6 +76,36 @@ def test_get_total_returns(
     assert sorted(returns.columns) == sorted(test_tickers)
 
 
+def test_get_total_returns_dtype(market_data: MarketData) -> None:
+    """Test get_total_returns method with dtype."""
+    prices = pd.DataFrame({"AAPL": [1.0, 2.0, 3.0], "MSFT": [2.0, 1.0, 2.0]})
+    with patch.object(MarketData, "load_prices", return_value=prices):
+        returns = market_data.get_total_returns(
+            tickers=("AAPL", "MSFT"), start_date=pd.Timestamp("2023-01-01")
+        )
+        returns_32 = market_data.get_total_returns(
+            tickers=("AAPL", "MSFT"), start_date=pd.Timestamp("2023-01-01"), dtype="float32"
+        )
+    assert (returns.dtypes == "float64").all()
+    assert (returns_32.dtypes == "float32").all()
+    assert returns_32.to_dict("list") == {"AAPL": [1.0, 0.5], "MSFT": [-0.5, 1.0]}
+    pd.testing.assert_frame_equal(returns, prices.pct_change().iloc[1:, :])
+
+
+def test_get_total_returns_missing_prices(market_data: MarketData) -> None:
+    """Test get_total_returns method forward fills the missing prices."""
+    prices = pd.DataFrame(
+        {"AAPL": [1.0, 2.0, np.nan, 4.0, 5.0], "MSFT": [np.nan, 1.0, 2.0, 4.0, 4.0]}
+    )
+    with patch.object(MarketData, "load_prices", return_value=prices):
+        returns = market_data.get_total_returns(
+            tickers=("AAPL", "MSFT"), start_date=pd.Timestamp("2023-01-01")
+        )
+    assert returns["AAPL"].to_list() == [1.0, 0.0, 1.0, 0.25]
+    assert np.isnan(returns["MSFT"].iloc[0])
+    assert returns["MSFT"].iloc[1:].to_list() == [1.0, 1.0, 0.0]
+
+
 @pytest.mark.vcr()
 def test_get_assets_from_provider(
     market_data: MarketData,
@@ -85,6 +120,53 @@ def test_get_assets_from_provider(
     assert all(isinstance(a, AssetModel) for a in assets)
 
 
+@pytest.mark.parametrize("start_date", [None, pd.NaT])
+def test_load_prices_without_start_date(tmp_path: Path, start_date: pd.Timestamp | None) -> None:
+    """Test the prices from the first available date skip the on-disk cache."""
+    market_data = MarketData(cache_dir=str(tmp_path), prefetch=True)
+    market_data._prefetch_pool = Mock()
+    prices = pd.DataFrame({"AAPL": [1.0, 2.0]}, index=["2023-01-03", "2023-01-04"])
+    with patch.object(AlpacaMarketData, "get_prices", return_value=prices) as mock_prices:
+        loaded = market_data.load_prices(tickers=("AAPL",), start_date=start_date)  # type: ignore
+    mock_prices.assert_called_once()
+    pd.testing.assert_frame_equal(loaded, prices)
+    assert not any(tmp_path.rglob("*.parquet"))
+    market_data._prefetch_pool.submit.assert_not_called()
+
+
+def test_load_prices_prefetch(tmp_path: Path) -> None:
+    """Test the adjacent date ranges are prefetched only once."""
+    market_data = MarketData(cache_dir=str(tmp_path), prefetch=True)
+    market_data._prefetch_pool = Mock()
+    start_date, end_date = pd.Timestamp("2023-01-01"), pd.Timestamp("2023-03-01")
+    with patch.object(MarketData, "_load_prices", return_value=pd.DataFrame()):
+        for _ in range(2):
+            market_data.load_prices(tickers=("AAPL",), start_date=start_date, end_date=end_date)
+    windows = [
+        (c.kwargs["start_date"], c.kwargs["end_date"])
+        for c in market_data._prefetch_pool.submit.call_args_list
+    ]
+    assert windows == [
+        (start_date - PREFETCH_WINDOW, start_date),
+        (end_date, end_date + PREFETCH_WINDOW),
+    ]
+    assert not MarketData(cache_dir=None, prefetch=True).prefetch
+
+
+def test_get_total_number_of_shares_cache(market_data_nodb: MarketData) -> None:
+    """Test the number of shares are cached until SHARES_CACHE_TTL expires."""
+    shares = pd.Series({"AAPL": 123}, name="number_of_shares")
+    with patch.object(
+        YahooMarketData, "get_multi_number_of_shares", return_value=shares
+    ) as mock_shares, patch("time.time", return_value=0.0) as mock_time:
+        for _ in range(2):
+            market_data_nodb.get_total_number_of_shares(("AAPL",))
+        mock_shares.assert_called_once()
+        mock_time.return_value = SHARES_CACHE_TTL.total_seconds()
+        market_data_nodb.get_total_number_of_shares(("AAPL",))
+    assert mock_shares.call_count == 2  # noqa: PLR2004
+
+
 def test_get_assets_from_provider_error(
     market_data: MarketData,
     test_tickers: tuple[str, ...],
@@ -118,6 +200,45 @@ def test_get_market_caps(
     assert sorted(mkt_caps.columns) == sorted(test_tickers)
 
 
+def test_get_latest_market_caps(market_data_nodb: MarketData) -> None:
+    """Test get_latest_market_caps method."""
+    prices = pd.DataFrame({"AAPL": [1.0, 2.0], "MSFT": [3.0, 4.0]})
+    shares = pd.Series({"AAPL": 10, "MSFT": 100}, name="number_of_shares")
+    with patch.object(MarketData, "load_prices", return_value=prices), patch.object(
+        MarketData, "get_total_number_of_shares", return_value=shares
+    ):
+        mkt_caps = market_data_nodb.get_latest_market_caps(tickers=("AAPL", "MSFT"))
+        top_caps = market_data_nodb.get_top_market_caps(tickers=("AAPL", "MSFT"), top=1)
+    assert mkt_caps.to_dict() == {"AAPL": 20.0, "MSFT": 400.0}
+    assert top_caps.to_dict() == {"MSFT": 400.0}
+
+
+def test_get_assets_df_nodb(market_data_nodb: MarketData) -> None:
+    """Test get_assets_df method without db."""
+    asset = AssetModel(
+        ticker="TEST",
+        name="TEST",
+        country="TEST",
+        currency="TEST",
+        logo="TEST",
+        ipo="2012-12-12",
+        asset_class="us_equity",
+        exchange="NYSE",
+        status="active",
+        tradable=True,
+        marginable=True,
+        fractionable=True,
+    )
+    with patch.object(MarketData, "get_assets", return_value=[asset]):
+        assets_df = market_data_nodb.get_assets_df(tickers=("TEST",))
+    assert list(assets_df.columns) == list(AssetModel.model_fields)
+    assert assets_df.to_dict("records") == [asset.model_dump()]
+    with patch.object(MarketData, "get_assets", return_value=[]):
+        assert list(market_data_nodb.get_assets_df(tickers=("TEST",)).columns) == list(
+            AssetModel.model_fields
+        )
+
+
 @pytest.mark.vcr()
 def test_get_tradable_tickers(
     market_data: MarketData,
@@ -0,0 +1,26 @@
+"""Test sessions module."""
+
+from unittest.mock import Mock
+
+from requests import Session
+from yahooquery.utils import USER_AGENT_LIST
+
+from optitrader.market.sessions import init_yahoo_session, mount_pool
+
+
+def test_mount_pool() -> None:
+    """Test the pool is mounted on a session or on the session of a client."""
+    session = Session()
+    assert mount_pool(session, pool_connections=1, pool_maxsize=5)
+    adapter = session.get_adapter("https://test")
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 5  # type: ignore  # noqa: PLR2004
+    client = Mock(_session=Session())
+    assert mount_pool(client, pool_connections=1, pool_maxsize=5)
+    assert not mount_pool(object(), pool_connections=1, pool_maxsize=5)
+
+
+def test_init_yahoo_session() -> None:
+    """Test the yahoo session gets the headers used by yahooquery."""
+    session = init_yahoo_session(Session())
+    assert session.headers["User-Agent"] in USER_AGENT_LIST
+    assert session.headers["origin"] == "https://finance.yahoo.com"
@@ -30,12 +30,37 @@ def test_get_yahoo_asset_profile_returning_none() -> None:
     """Test get_yahoo_asset method."""
     t = "AAPL"
     with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
-        mock_ticker.return_value.asset_profile = None
+        mock_ticker.return_value.get_modules.return_value = None
         asset = client.get_yahoo_asset(ticker=t)
     assert isinstance(asset, YahooAssetModel)
     assert all(a is None for a in asset.model_dump().values())
 
 
+def test_tickers_share_sessions() -> None:
+    """Test the Ticker instances reuse the client sessions."""
+    with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
+        client.get_yahoo_asset(ticker="AAPL")
+        client.get_multi_number_of_shares(tickers=("AAPL", "MSFT"))
+    sessions = [c.kwargs["session"] for c in mock_ticker.call_args_list]
+    assert sessions == [client._session, client._async_session]
+
+
+def test_get_yahoo_asset_single_query() -> None:
+    """Test get_yahoo_asset queries the profile and the key stats together."""
+    with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
+        mock_ticker.return_value.get_modules.return_value = {
+            "BRK-B": {
+                "assetProfile": {"industry": "Insurance", "longBusinessSummary": "TEST"},
+                "defaultKeyStatistics": {"sharesOutstanding": 123},
+            },
+        }
+        asset = client.get_yahoo_asset(ticker="BRK.B", fail_on_yf_error=True)
+    mock_ticker.return_value.get_modules.assert_called_once()
+    assert asset.industry == "Insurance"
+    assert asset.business_summary == "TEST"
+    assert asset.number_of_shares == 123  # noqa: PLR2004
+
+
 @pytest.mark.my_vcr()
 def test_get_yahoo_asset_failure() -> None:
     """Test get_yahoo_asset method."""
@@ -95,3 +120,60 @@ def test_get_multi_financials_by_item(test_tickers: tuple[str, ...]) -> None:
     assert isinstance(fin_df, DataFrame)
     if not fin_df.empty:
         assert sorted(fin_df.columns) == sorted(test_tickers)
+
+
+def test_get_multi_yahoo_assets() -> None:
+    """Test get_multi_yahoo_assets method."""
+    with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
+        mock_ticker.return_value.get_modules.return_value = {
+            "AAPL": {
+                "assetProfile": {"industry": "Consumer Electronics", "longBusinessSummary": "TEST"},
+                "defaultKeyStatistics": {"sharesOutstanding": 123},
+            },
+            "BRK-B": "No fundamentals data found",
+        }
+        assets = client.get_multi_yahoo_assets(tickers=("AAPL", "BRK.B"))
+    mock_ticker.assert_called_once()
+    mock_ticker.return_value.get_modules.assert_called_once()
+    assert sorted(assets) == ["AAPL", "BRK.B"]
+    assert assets["AAPL"].number_of_shares == 123  # noqa: PLR2004
+    assert assets["AAPL"].business_summary == "TEST"
+    assert all(a is None for a in assets["BRK.B"].model_dump().values())
+
+
+def test_get_multi_yahoo_assets_error() -> None:
+    """Test get_multi_yahoo_assets method when the query fails."""
+    with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
+        mock_ticker.return_value.get_modules.side_effect = ConnectionError
+        assets = client.get_multi_yahoo_assets(tickers=("AAPL", "MSFT"))
+    assert sorted(assets) == ["AAPL", "MSFT"]
+    assert all(a == YahooAssetModel() for a in assets.values())
+
+
+def test_get_multi_number_of_shares_errors() -> None:
+    """Test get_multi_number_of_shares method with missing shares."""
+    with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
+        mock_ticker.return_value.key_stats = {
+            "AAPL": {"sharesOutstanding": 123},
+            "BRK-B": "No fundamentals data found",
+            "MSFT": {"sharesOutstanding": None},
+        }
+        shares = client.get_multi_number_of_shares(tickers=("AAPL", "BRK.B", "MSFT"))
+    assert isinstance(shares, Series)
+    assert shares.to_dict() == {"AAPL": 123, "BRK.B": 0, "MSFT": 0}
+
+
+def test_get_multi_financials() -> None:
+    """Test get_multi_financials method."""
+    with patch("optitrader.market.yahoo_market_data.Ticker") as mock_ticker:
+        mock_ticker.return_value.get_financial_data.return_value = DataFrame(
+            {
+                "symbol": ["AAPL", "BRK-B"],
+                "asOfDate": [Timestamp("2023-03-31"), Timestamp("2023-03-31")],
+                client.financials[0]: [1.0, 2.0],
+            }
+        ).set_index("symbol")
+        fin_df = client.get_multi_financials(tickers=("AAPL", "BRK.B"))
+    assert isinstance(fin_df, DataFrame)
+    assert list(fin_df.columns) == client.financials
+    assert sorted(fin_df.index.get_level_values("symbol")) == ["AAPL", "BRK.B"]
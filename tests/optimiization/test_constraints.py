@@ -19,6 +19,15 @@ def test_unbounded_constr() -> None:
     )
 
 
+def test_number_of_assets_constr_without_bounds() -> None:
+    """Test the number of assets constraint without bounds adds no constraints."""
+    weights = cp.Variable(3)
+    assert NumberOfAssetsConstraint().get_constraints_list(weights) == []
+    constraints = NumberOfAssetsConstraint(upper_bound=2).get_constraints_list(weights)
+    assert len(constraints) == 2  # noqa: PLR2004
+    assert any(v.attributes["boolean"] for c in constraints for v in c.variables())
+
+
 def test_constraints_map() -> None:
     """Test the ConstraintsMap initialization without constraints and add financials."""
     constr_map = ConstraintsMap()
@@ -37,6 +46,17 @@ def test_add_constraint() -> None:
     assert len(constr_map.constraints) == 1
 
 
+def test_constraints_bounds_not_shared() -> None:
+    """Test the bounds set on a constraint do not leak to other constraints."""
+    constr_map = ConstraintsMap()
+    name = ConstraintName.NUMER_OF_ASSETS
+    constr_map.set_constraint_bounds(name=name, lower_bound=3)
+    constr = ConstraintsMap().to_constraint(name)
+    assert isinstance(constr, NumberOfAssetsConstraint)
+    assert constr.lower_bound is None
+    assert constr is not constr_map.get_constraint_by_name(name)
+
+
 def test_constraints_map_with_names() -> None:
     """Test the ConstraintsMap initialization with constraints."""
     constr_map = ConstraintsMap(
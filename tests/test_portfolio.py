@@ -38,6 +38,26 @@ def test_portfolio_repr() -> None:
     assert ObjectiveName.CVAR.value in _rep
 
 
+def test_portfolio_hash() -> None:
+    """Test portfolios with the same weights are equal and hashed the same."""
+    test_w = {
+        "MSFT": 0.3,
+        "TSLA": 0.7,
+    }
+    ptf = Portfolio(weights=test_w)
+    same_ptf = Portfolio(weights=pd.Series(test_w))
+    other_ptf = Portfolio(weights={"MSFT": 0.7, "TSLA": 0.3})
+    assert ptf == same_ptf
+    assert hash(ptf) == hash(same_ptf)
+    assert ptf != other_ptf
+    assert ptf != test_w
+    assert len({ptf, same_ptf, other_ptf}) == 2  # noqa: PLR2004
+    int_ptf = Portfolio(weights={"MSFT": 1, "TSLA": 0}, rescale_weights=False)
+    float_ptf = Portfolio(weights={"MSFT": 1.0, "TSLA": -0.0})
+    assert int_ptf == float_ptf
+    assert hash(int_ptf) == hash(float_ptf)
+
+
 def test_portfolio_repr_with_dict_weights() -> None:
     """Test portfolio representation."""
     test_w = {
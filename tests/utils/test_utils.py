@@ -1,5 +1,7 @@
 """Test general utils."""
-from optitrader.utils import clean_string, remove_punctuation
+import pandas as pd
+
+from optitrader.utils import clean_string, remove_punctuation, to_daily_range
 
 
 def test_remove_punctuation():
@@ -30,3 +32,21 @@ def test_clean_string():
 
     # Test case with both underscore and hyphen
     assert clean_string("clean_string-here") == "clean string here"
+
+
+def test_to_daily_range():
+    """Test to_daily_range function."""
+    # Test case with times within the days
+    assert to_daily_range(
+        pd.Timestamp("2023-01-02 15:30"),
+        pd.Timestamp("2023-01-05 09:10"),
+    ) == (pd.Timestamp("2023-01-02"), pd.Timestamp("2023-01-06"))
+
+    # Test case with dates at midnight
+    assert to_daily_range(pd.Timestamp("2023-01-02"), pd.Timestamp("2023-01-05")) == (
+        pd.Timestamp("2023-01-02"),
+        pd.Timestamp("2023-01-05"),
+    )
+
+    # Test case without end date
+    assert to_daily_range(pd.Timestamp("2023-01-02 15:30")) == (pd.Timestamp("2023-01-02"), None)